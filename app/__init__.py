@@ -13,10 +13,25 @@ The create_app function:
 5. Defines routes
 """
 
-from flask import Flask, render_template, jsonify
+import hashlib
+from flask import Flask, Response, render_template, request
 from flask_cors import CORS
-from app.extensions import mongo
+from flask_compress import Compress
+from app.extensions import mongo, events_cache, events_cache_lock
+from app.json_provider import OrjsonProvider
 from app.webhook.routes import webhook
+from app.webhook.queue import event_queue
+
+# Fields returned by /api/events - only what the frontend actually renders
+EVENT_PROJECTION = {
+    '_id': 0,
+    'request_id': 1,
+    'author': 1,
+    'action': 1,
+    'from_branch': 1,
+    'to_branch': 1,
+    'timestamp': 1
+}
 
 
 def create_app():
@@ -48,15 +63,33 @@ def create_app():
     # 3. Load all UPPERCASE attributes as config values
     app.config.from_object('config.Config')
     
+    # Use orjson for all JSON serialization (jsonify, app.json.dumps)
+    # It's several times faster than the stdlib json module and handles
+    # datetime values natively
+    app.json = OrjsonProvider(app)
+    
+    # Set the log level for the app logger and its children
+    # (e.g. app.webhook.routes) from configuration
+    app.logger.setLevel(app.config['LOG_LEVEL'])
+    
     # Initialize MongoDB extension with this app instance
     # This establishes the database connection using app.config['MONGO_URI']
     mongo.init_app(app)
     
+    # Start the background thread that batches webhook events into MongoDB
+    event_queue.init_app(app)
+    
     # Initialize CORS (Cross-Origin Resource Sharing)
     # This allows the API to be called from different domains
     # Useful when frontend and backend are on different servers
     CORS(app)
     
+    # Initialize response compression (gzip/brotli)
+    # The /api/events JSON compresses very well (repeated field names,
+    # timestamps, branch names), and every open tab polls it every 15 s
+    # Settings come from COMPRESS_* in config.py
+    Compress(app)
+    
     # Register the webhook blueprint
     # Blueprints allow us to organize routes into modules
     # The webhook blueprint handles all /webhook/* routes
@@ -88,34 +121,105 @@ def create_app():
         
         Returns:
             JSON: Array of event objects, limited to 10 most recent
+            304: Not Modified, if the client's If-None-Match header matches
+                 the ETag of the current events (no body is sent)
             
         Response Format:
             [
                 {
-                    "_id": "507f1f77bcf86cd799439011",
                     "request_id": "abc123",
                     "author": "username",
                     "action": "PUSH|PULL_REQUEST|MERGE",
                     "from_branch": "feature",
                     "to_branch": "main",
-                    "timestamp": "2024-01-01T12:00:00.000000"
+                    "timestamp": "2024-01-01T12:00:00.000000+00:00"
                 }
             ]
         """
-        # Query MongoDB for events
-        # .find() - gets all documents from 'events' collection
-        # .sort('timestamp', -1) - sorts by timestamp descending (newest first)
-        # .limit(10) - limits results to 10 documents
-        # list() - converts cursor to list for easier manipulation
-        events = list(mongo.db.events.find().sort('timestamp', -1).limit(10))
+        # Serve the cached response if one was built in the last few seconds
+        # The lock is held across the query so concurrent pollers that miss
+        # together wait for one query instead of each running their own
+        with events_cache_lock:
+            cached = events_cache.get('latest')
+            if cached is None:
+                body = _query_latest_events(app)
+                # Strong ETag derived from the response body itself, so it
+                # changes exactly when the events the client sees change
+                etag = hashlib.sha1(body).hexdigest()
+                cached = (body, etag)
+                events_cache['latest'] = cached
+        body, etag = cached
         
-        # MongoDB's ObjectId is not JSON serializable by default
-        # We need to convert it to string for the JSON response
-        for event in events:
-            event['_id'] = str(event['_id'])
+        # Answer 304 Not Modified (no body) when nothing changed since the
+        # client's last poll
+        if _etag_matches(request.if_none_match, etag):
+            response = Response(status=304)
+        else:
+            # Return the pre-serialized JSON with proper content-type headers
+            response = Response(body, mimetype='application/json')
         
-        # Return events as JSON with proper content-type headers
-        return jsonify(events)
+        # Cache-Control: no-cache makes browsers revalidate on every poll;
+        # fetch() then sees the cached body when the server answers 304
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
     
     # Return the configured app instance
     return app
+
+
+def _query_latest_events(app):
+    """
+    Fetch the 10 most recent events and serialize them to JSON.
+    
+    Args:
+        app (Flask): The application whose (orjson) JSON provider is used
+    
+    Returns:
+        bytes: JSON-encoded array of event objects, ready to send
+    """
+    # Query MongoDB for events
+    # .find() - gets all documents from 'events' collection, projected
+    #           down to the fields the UI renders. _id is excluded since
+    #           request_id already identifies each event, which also means
+    #           no ObjectId needs converting before serialization
+    # .sort('timestamp', -1) - sorts by timestamp descending (newest first)
+    # .limit(10) - limits results to 10 documents
+    # .batch_size(10) - fetch all 10 in one batch instead of the
+    #                   default 101-document first batch
+    # list() - converts cursor to list for easier manipulation
+    events = list(
+        mongo.db.events.find({}, EVENT_PROJECTION)
+        .sort('timestamp', -1)
+        .limit(10)
+        .batch_size(10)
+    )
+    
+    # Serialize once; the bytes are what gets cached
+    # The orjson provider writes the BSON Date timestamps (tz-aware
+    # datetimes) as ISO 8601 strings with their UTC offset natively
+    return app.json.dumps_bytes(events)
+
+
+def _etag_matches(if_none_match, etag):
+    """
+    Check whether the client's If-None-Match header covers our ETag.
+    
+    Flask-Compress rewrites the ETag of compressed responses to
+    "<etag>:<algorithm>" (e.g. "<etag>:br"), and browsers send that value
+    back. The suffix is stripped before comparing so compressed clients
+    still get their 304.
+    
+    Args:
+        if_none_match (ETags): The parsed If-None-Match request header
+        etag (str): The ETag of the current events response
+    
+    Returns:
+        bool: True if the client already has the current events
+    """
+    if if_none_match.star_tag:
+        return True
+    return any(
+        tag.split(':', 1)[0] == etag
+        for tag in if_none_match.as_set(include_weak=True)
+    )
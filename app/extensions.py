@@ -8,9 +8,17 @@ The MongoDB class manages the database connection and provides easy access to th
 instance throughout the application.
 """
 
-from pymongo import MongoClient
+from pymongo import MongoClient, DESCENDING
+from pymongo.errors import CollectionInvalid
+from cachetools import TTLCache
+import threading
 import os
 
+# Limits for the capped events collection: whichever is hit first wins,
+# and the oldest events are discarded to make room for new ones
+EVENTS_CAPPED_SIZE = 64 * 1024 * 1024  # 64 MB
+EVENTS_CAPPED_MAX = 100000             # documents
+
 
 class MongoDB:
     """
@@ -50,8 +58,22 @@ class MongoDB:
         """
         Initialize the MongoDB connection with the Flask application.
         
-        This method is called during app creation to establish the database
-        connection using configuration from the Flask app.
+        This method is called during app creation to create the client and
+        make sure the events collection and its index exist.
+        
+        Args:
+            app (Flask): The Flask application instance containing configuration
+        """
+        self.connect(app)
+        self.init_collections()
+    
+    def connect(self, app):
+        """
+        Create the MongoDB client and select the application database.
+        
+        This only builds the client - no collections or indexes are touched -
+        so it is cheap to call again, e.g. from gunicorn's post_fork hook to
+        give each worker its own connection pool.
         
         Args:
             app (Flask): The Flask application instance containing configuration
@@ -69,9 +91,28 @@ class MongoDB:
         mongo_uri = app.config.get('MONGO_URI')
         
         # Create MongoDB client with the connection string
-        # This establishes the connection pool but doesn't actually connect yet
-        # MongoDB uses lazy connection - it connects when first operation is performed
-        self.client = MongoClient(mongo_uri)
+        # - connect=False: don't open connections until the first operation.
+        #   Note that init_collections() runs right after this at boot and
+        #   does connect, so under gunicorn --preload the master holds a live
+        #   pool; gunicorn.conf.py closes it in the master and calls
+        #   connect() again in each worker after the fork.
+        # - maxPoolSize/minPoolSize: a small app doesn't need the default
+        #   100 connections per worker; keep a couple warm for low latency
+        # - serverSelectionTimeoutMS: fail fast instead of hanging 30 s
+        #   when the cluster is unreachable
+        # - appname: shows up in MongoDB server logs and Atlas metrics
+        # - tz_aware: return dates as UTC-aware datetimes, matching what
+        #   the webhook receiver stores
+        self.client = MongoClient(
+            mongo_uri,
+            connect=False,
+            maxPoolSize=20,
+            minPoolSize=2,
+            serverSelectionTimeoutMS=3000,
+            retryWrites=True,
+            appname='webhook-repo',
+            tz_aware=True
+        )
         
         # Select the specific database we'll be using
         # TODO: Extract database name from URI or make it configurable
@@ -81,9 +122,52 @@ class MongoDB:
         # Get reference to our database
         # This doesn't create the database - MongoDB creates it on first write
         self.db = self.client[db_name]
-
+    
+    def init_collections(self):
+        """
+        Create the events collection and its index if they don't exist yet.
+        
+        This talks to the server, so it runs once at app creation rather
+        than every time a client is (re)built.
+        """
+        # Create the events collection as a capped collection on first boot
+        # The UI only ever shows the latest 10 events, so old ones can be
+        # discarded; capping keeps the collection (and the timestamp index)
+        # small enough to stay in RAM no matter how long the app runs.
+        # An existing, uncapped collection is left untouched.
+        if 'events' not in self.db.list_collection_names(filter={'name': 'events'}):
+            try:
+                self.db.create_collection(
+                    'events',
+                    capped=True,
+                    size=EVENTS_CAPPED_SIZE,
+                    max=EVENTS_CAPPED_MAX
+                )
+            except CollectionInvalid:
+                # Another worker created it between our check and create
+                pass
+        
+        # Index the events collection on timestamp (newest first)
+        # /api/events sorts by timestamp and takes the top 10 on every poll;
+        # with this index MongoDB walks 10 index keys instead of sorting the
+        # whole collection in memory. create_index is idempotent, so it is
+        # safe to run on every boot.
+        self.db.events.create_index(
+            [('timestamp', DESCENDING)],
+            background=True,
+            name='ts_desc'
+        )
 
 # Create a singleton instance of MongoDB extension
 # This instance will be imported and used throughout the application
 # Following the Flask extension pattern for easy integration
 mongo = MongoDB()
+
+# Short-lived cache for the serialized /api/events response
+# Every open tab polls the endpoint, so for the few seconds an entry lives
+# all pollers share one MongoDB round-trip. The lock is held across the
+# query on a miss so concurrent misses collapse into a single query, and
+# the event queue clears the cache after each write so new events show
+# up on the very next poll.
+events_cache = TTLCache(maxsize=1, ttl=3)
+events_cache_lock = threading.Lock()
@@ -0,0 +1,78 @@
+"""
+orjson JSON Provider Module
+===========================
+This module provides a Flask JSON provider backed by orjson.
+
+Flask routes all JSON work (jsonify, app.json.dumps, request.get_json) through
+app.json. Swapping in this provider makes every endpoint serialize with orjson,
+which is several times faster than the stdlib json module and handles datetime
+objects natively - so /api/events doesn't need to format timestamps in Python.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+import orjson
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes and parses with orjson.
+
+    Usage:
+        # In app factory
+        app.json = OrjsonProvider(app)
+
+        # Anywhere in the app
+        return jsonify(data)
+    """
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize obj to a JSON string.
+
+        Args:
+            obj: The object to serialize
+            **kwargs: Accepted for compatibility with Flask's provider API;
+                orjson doesn't take stdlib json options, so they're ignored
+
+        Returns:
+            str: The JSON document
+        """
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def dumps_bytes(self, obj):
+        """
+        Serialize obj straight to UTF-8 encoded JSON bytes.
+
+        orjson produces bytes natively, so callers that need bytes (e.g. a
+        response body that gets cached) should use this rather than dumps()
+        to avoid a decode/encode round-trip.
+
+        Args:
+            obj: The object to serialize
+
+        Returns:
+            bytes: The JSON document
+
+        Options:
+            - OPT_NAIVE_UTC: treat naive datetimes as UTC
+            - default=str: fall back to str() for anything else orjson
+              doesn't know (e.g. ObjectId)
+        """
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_NAIVE_UTC,
+            default=str
+        )
+
+    def loads(self, s, **kwargs):
+        """
+        Parse a JSON string or bytes.
+
+        Args:
+            s (str | bytes): The JSON document
+            **kwargs: Ignored, see dumps()
+
+        Returns:
+            The parsed Python object
+        """
+        return orjson.loads(s)
@@ -0,0 +1,238 @@
+"""
+Event Write Queue Module
+========================
+This module batches webhook events before writing them to MongoDB.
+
+During a large rebase or a bulk PR merge GitHub can deliver dozens of webhooks
+per second. Instead of one MongoDB round-trip per webhook, the receiver appends
+each event to an in-memory queue and returns immediately. A single background
+thread drains the queue and writes whatever has accumulated with one
+insert_many call, amortizing the network and acknowledgement cost.
+
+Flow:
+    1. receiver() calls event_queue.put(event_data)
+    2. The worker thread wakes up (or times out after FLUSH_INTERVAL)
+    3. Up to MAX_BATCH_SIZE events are written with insert_many
+    4. The cached /api/events response is cleared so new events show up
+
+Delivery guarantee:
+    At-most-once. GitHub gets its 200 as soon as an event is queued, before
+    it is written. If a write fails, the events are put back at the front of
+    the queue and retried with exponential backoff, up to MAX_RETRIES times.
+    Events are lost (and logged at ERROR with their request_ids) when the
+    retries run out, when they are still queued as the process exits and
+    MongoDB is unreachable, or when the process is killed outright.
+"""
+
+from collections import deque
+import atexit
+import logging
+import threading
+from pymongo.errors import BulkWriteError
+from app.extensions import mongo, events_cache, events_cache_lock
+
+logger = logging.getLogger(__name__)
+
+# MongoDB error code for a duplicate _id
+DUPLICATE_KEY_ERROR = 11000
+
+
+class EventQueue:
+    """
+    In-memory queue of events with a background MongoDB flusher.
+
+    Attributes:
+        MAX_BATCH_SIZE (int): Maximum number of events per insert_many call
+        FLUSH_INTERVAL (float): Seconds the worker waits for new events
+            before checking the queue again
+        MAX_RETRIES (int): Failed writes of a batch before it is dropped
+        RETRY_BACKOFF (float): Seconds to wait after the first failed write;
+            doubled after each further failure
+
+    Usage:
+        # In app factory
+        event_queue.init_app(app)
+
+        # In a route
+        event_queue.put(event_data)
+    """
+
+    MAX_BATCH_SIZE = 500
+    FLUSH_INTERVAL = 0.1
+    MAX_RETRIES = 8
+    RETRY_BACKOFF = 0.5
+
+    def __init__(self):
+        """
+        Initialize the queue.
+
+        The worker thread is not started here - it's deferred until
+        init_app() is called, following the same pattern as the MongoDB
+        extension.
+        """
+        self._atexit_registered = False    # Shutdown hook installed
+        self.reset()
+
+    def reset(self):
+        """
+        Discard all queue state and forget the worker thread.
+
+        Called in a forked child (see gunicorn.conf.py) before init_app():
+        threads don't survive a fork, and the Events inherited from the
+        parent may be locked, set to stopping, or both. Fresh objects let
+        the child start a working flusher of its own.
+        """
+        self._events = deque()             # Pending event documents
+        self._wakeup = threading.Event()   # Set when new events arrive
+        self._stopping = threading.Event() # Set on interpreter shutdown
+        self._worker = None                # Background flusher thread
+        self._failures = 0                 # Consecutive failed writes
+
+    def init_app(self, app):
+        """
+        Start the background flusher thread.
+
+        Safe to call more than once (e.g. when several apps are created);
+        only one worker thread is started per process.
+
+        Args:
+            app (Flask): The Flask application instance
+        """
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        self._worker = threading.Thread(
+            target=self._run,
+            name='event-queue-flusher',
+            daemon=True  # Never keep the process alive on its own
+        )
+        self._worker.start()
+
+        # Flush whatever is still queued when the process exits
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    def put(self, event_data):
+        """
+        Queue an event document for insertion.
+
+        deque.append is thread-safe, so request threads don't need a lock.
+
+        Args:
+            event_data (dict): The event document to store
+        """
+        self._events.append(event_data)
+        self._wakeup.set()
+
+    def shutdown(self, timeout=5):
+        """
+        Stop the worker thread after it writes any remaining events.
+
+        Args:
+            timeout (float): Seconds to wait for the final flush
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def _run(self):
+        """
+        Worker loop: wait for events, then flush them in batches.
+
+        After a failed write the worker backs off before trying again,
+        doubling the wait with each consecutive failure.
+        """
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.FLUSH_INTERVAL)
+            self._wakeup.clear()
+            while self._events:
+                if not self._flush():
+                    backoff = self.RETRY_BACKOFF * 2 ** (self._failures - 1)
+                    self._stopping.wait(backoff)
+                    break
+
+        # Final drain on shutdown - no backoff, stop at the first failure
+        while self._events:
+            if not self._flush():
+                break
+        if self._events:
+            self._drop(list(self._events), "process is exiting")
+            self._events.clear()
+
+    def _flush(self):
+        """
+        Write up to MAX_BATCH_SIZE queued events with a single insert_many.
+
+        Events that fail to write are put back at the front of the queue,
+        unless the batch has already failed MAX_RETRIES times in a row.
+
+        Returns:
+            bool: True if the batch was written (or dropped), False if it
+                was re-queued and the caller should back off
+        """
+        batch = []
+        while self._events and len(batch) < self.MAX_BATCH_SIZE:
+            batch.append(self._events.popleft())
+
+        if not batch:
+            return True
+
+        try:
+            # ordered=False lets MongoDB apply the whole batch even if one
+            # document fails, and allows the server to parallelize the writes
+            mongo.db.events.insert_many(batch, ordered=False)
+            failed = []
+        except BulkWriteError as e:
+            # Some documents were written. Duplicate _ids mean a document
+            # was already stored by an earlier, partly failed attempt, so
+            # only the other errors need retrying
+            failed = [
+                batch[error['index']]
+                for error in e.details.get('writeErrors', [])
+                if error.get('code') != DUPLICATE_KEY_ERROR
+            ]
+            if failed:
+                logger.warning("Error saving %d of %d event(s) to MongoDB: %s",
+                               len(failed), len(batch), e)
+        except Exception as e:
+            failed = batch
+            logger.warning("Error saving %d event(s) to MongoDB: %s", len(batch), e)
+
+        if len(failed) < len(batch):
+            logger.debug("Saved %d event(s) to MongoDB", len(batch) - len(failed))
+
+            # Drop the cached /api/events response so the new events
+            # appear on the next poll instead of after the cache expires
+            with events_cache_lock:
+                events_cache.clear()
+
+        if not failed:
+            self._failures = 0
+            return True
+
+        self._failures += 1
+        if self._failures > self.MAX_RETRIES:
+            self._drop(failed, "retries exhausted")
+            self._failures = 0
+            return True
+
+        # Put the failed events back at the front, keeping their order
+        self._events.extendleft(reversed(failed))
+        return False
+
+    def _drop(self, events, reason):
+        """
+        Log events that are given up on, so they can be recovered by hand.
+
+        Args:
+            events (list): The event documents that won't be written
+            reason (str): Why they are being dropped
+        """
+        logger.error("Dropping %d event(s) (%s): %s", len(events), reason,
+                     [event.get('request_id') for event in events])
+
+# Create a singleton instance of the event queue
+# Imported by the webhook routes and started by the app factory
+event_queue = EventQueue()
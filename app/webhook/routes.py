@@ -15,11 +15,20 @@ Supported Events:
     - merge: When a PR is merged (special case of pull_request closed)
 """
 
-from flask import Blueprint, json, request, jsonify
-from datetime import datetime
+from flask import Blueprint, request, jsonify
+from datetime import datetime, timezone
+from functools import lru_cache
 import hmac
-import hashlib
-from app.extensions import mongo
+import logging
+import re
+import orjson
+from bson import ObjectId
+from app.webhook.queue import event_queue
+
+# Module logger - a child of the app logger, so it follows LOG_LEVEL
+# Debug calls are skipped before any string formatting when the level
+# is above DEBUG, which keeps per-webhook logging free in production
+logger = logging.getLogger(__name__)
 
 # Create a Blueprint for webhook routes
 # This groups all webhook-related routes under the /webhook prefix
@@ -30,6 +39,15 @@ webhook = Blueprint(
     url_prefix='/webhook'  # All routes in this blueprint will be prefixed with /webhook
 )
 
+# UTC timezone for event timestamps (timezone-aware, unlike utcnow())
+_UTC = timezone.utc
+
+# Prefix GitHub puts in front of branch names in push event refs
+BRANCH_REF_PREFIX = 'refs/heads/'
+
+# Expected shape of the X-Hub-Signature-256 header
+SIGNATURE_PATTERN = re.compile(r'sha256=[0-9a-f]{64}')
+
 
 def verify_webhook_signature(payload_body, signature_header, secret):
     """
@@ -66,20 +84,182 @@ def verify_webhook_signature(payload_body, signature_header, secret):
     if not signature_header:
         return False
     
+    # GitHub sends the signature as "sha256=<64 lowercase hex chars>"
+    # Check the shape before hashing anything, so malformed or junk
+    # headers are rejected without paying for a pass over the payload
+    if len(signature_header) != 71 or not SIGNATURE_PATTERN.fullmatch(signature_header):
+        return False
+    
+    # Decode the provided hex digest once so we can compare raw bytes
+    provided_digest = bytes.fromhex(signature_header[7:])
+    
     # Create HMAC-SHA256 hash of the payload using our secret
     # This recreates what GitHub should have sent
-    hash_object = hmac.new(
-        secret.encode('utf-8'),      # Secret must be bytes
-        msg=payload_body,            # Original payload bytes
-        digestmod=hashlib.sha256     # Use SHA256 algorithm
+    # hmac.digest is the one-shot form: it hands the whole payload to
+    # OpenSSL in a single call instead of building an HMAC object
+    expected_digest = hmac.digest(
+        _secret_bytes(secret),       # Secret must be bytes (encoded once)
+        payload_body,                # Original payload bytes
+        'sha256'                     # Use SHA256 algorithm
     )
     
-    # Format the hash as GitHub does: "sha256=<hex_digest>"
-    expected_signature = "sha256=" + hash_object.hexdigest()
-    
     # Use compare_digest for timing-attack-safe comparison
     # Regular == comparison can leak information through timing
-    return hmac.compare_digest(expected_signature, signature_header)
+    # Comparing the 32 raw bytes skips hex-encoding our digest
+    return hmac.compare_digest(expected_digest, provided_digest)
+
+
+@lru_cache(maxsize=4)
+def _secret_bytes(secret):
+    """
+    Encode the webhook secret to bytes once and reuse it.
+    
+    The secret only changes with configuration, so there's no need to
+    re-encode it on every incoming webhook.
+    
+    Args:
+        secret (str): The webhook secret from app configuration
+    
+    Returns:
+        bytes: UTF-8 encoded secret
+    """
+    return secret.encode('utf-8')
+
+
+def _handle_push(payload):
+    """
+    Push Event Processing
+    
+    Triggered when commits are pushed to the repository.
+    
+    Payload Structure:
+        {
+            "ref": "refs/heads/main",        # Branch reference
+            "after": "abc123...",            # Commit SHA after push
+            "pusher": {
+                "name": "username",          # GitHub username
+                "email": "user@example.com"
+            },
+            ...
+        }
+    
+    Returns:
+        dict: The PUSH event document
+    """
+    pusher = payload.get('pusher') or {}
+    
+    # Strip the "refs/heads/" prefix to get the branch name
+    # Only a leading prefix is removed; tag refs are kept as-is
+    ref = payload.get('ref') or ''
+    to_branch = ref[len(BRANCH_REF_PREFIX):] if ref.startswith(BRANCH_REF_PREFIX) else ref
+    
+    event_data = {
+        'request_id': payload.get('after', 'unknown'),  # Commit SHA
+        'author': pusher.get('name', 'Unknown'),
+        'action': 'PUSH',
+        'from_branch': None,  # Push events don't have a source branch
+        'to_branch': to_branch,  # Branch name without refs/heads/
+        'timestamp': datetime.now(_UTC)  # Current UTC time, stored as BSON Date
+    }
+    logger.debug("Push event: %s pushed to %s",
+                 event_data['author'], event_data['to_branch'])
+    return event_data
+
+
+def _handle_pr_open(payload):
+    """
+    Pull Request Opened/Reopened Event Processing
+    
+    Triggered when a PR is opened or reopened; stored as a PULL_REQUEST event.
+    
+    Payload Structure:
+        {
+            "action": "opened|reopened",
+            "pull_request": {
+                "id": 123,
+                "user": {"login": "username"},
+                "head": {"ref": "feature-branch"},
+                "base": {"ref": "main"}
+            }
+        }
+    
+    Returns:
+        dict: The PULL_REQUEST event document
+    """
+    # Bind the nested objects once instead of chaining .get() calls
+    # "or {}" also covers keys that are present but null
+    pr = payload.get('pull_request') or {}
+    user = pr.get('user') or {}
+    head = pr.get('head') or {}
+    base = pr.get('base') or {}
+    
+    event_data = {
+        'request_id': str(pr.get('id', 'unknown')),  # PR ID as string
+        'author': user.get('login', 'Unknown'),  # PR creator
+        'action': 'PULL_REQUEST',
+        'from_branch': head.get('ref', 'unknown'),  # Source branch
+        'to_branch': base.get('ref', 'unknown'),    # Target branch
+        'timestamp': datetime.now(_UTC)
+    }
+    logger.debug("PR event: %s created PR from %s to %s",
+                 event_data['author'], event_data['from_branch'], event_data['to_branch'])
+    return event_data
+
+
+def _handle_pr_close_maybe_merge(payload):
+    """
+    Pull Request Closed Event Processing
+    
+    Triggered when a PR is closed. Only closed PRs with merged=true are
+    stored, as MERGE events; PRs closed without merging are ignored.
+    
+    Payload Structure:
+        {
+            "action": "closed",
+            "pull_request": {
+                "head": {"ref": "feature-branch"},
+                "base": {"ref": "main"},
+                "merged": true|false,
+                "merged_by": {"login": "username"},
+                "merge_commit_sha": "abc123..."
+            }
+        }
+    
+    Returns:
+        dict: The MERGE event document, or None if the PR wasn't merged
+    """
+    pr = payload.get('pull_request') or {}
+    if not pr.get('merged'):
+        return None
+    
+    # Bind the nested objects once instead of chaining .get() calls
+    # "or {}" also covers keys that are present but null
+    merged_by = pr.get('merged_by') or {}
+    head = pr.get('head') or {}
+    base = pr.get('base') or {}
+    
+    event_data = {
+        'request_id': pr.get('merge_commit_sha', 'unknown'),  # Merge commit SHA
+        'author': merged_by.get('login', 'Unknown'),  # Who merged
+        'action': 'MERGE',
+        'from_branch': head.get('ref', 'unknown'),  # Source branch
+        'to_branch': base.get('ref', 'unknown'),    # Target branch
+        'timestamp': datetime.now(_UTC)
+    }
+    logger.debug("Merge event: %s merged %s to %s",
+                 event_data['author'], event_data['from_branch'], event_data['to_branch'])
+    return event_data
+
+
+# Event handlers keyed by (X-GitHub-Event, payload action)
+# Push payloads have no action, so they're keyed with None
+# To support a new event, add a handler above and an entry here
+_HANDLERS = {
+    ('push', None): _handle_push,
+    ('pull_request', 'opened'): _handle_pr_open,
+    ('pull_request', 'reopened'): _handle_pr_open,
+    ('pull_request', 'closed'): _handle_pr_close_maybe_merge,
+}
 
 
 @webhook.route('/receiver', methods=["POST"])
@@ -92,7 +272,7 @@ def receiver():
     2. Verifies the signature for security
     3. Parses the event type and payload
     4. Extracts relevant information based on event type
-    5. Stores the event in MongoDB
+    5. Queues the event for a batched write to MongoDB
     6. Returns appropriate HTTP response
     
     Expected Headers:
@@ -105,11 +285,21 @@ def receiver():
         - 200: Event processed successfully
         - 400: Bad request (invalid JSON, missing payload)
         - 401: Unauthorized (invalid signature)
-        - 500: Server error (database issues)
+        - 411: Length required (no Content-Length header)
+        - 413: Payload too large (over MAX_CONTENT_LENGTH, raised by Flask)
     """
     
-    # Log webhook receipt for debugging
-    print("\n=== WEBHOOK RECEIVED ===")
+    # Log webhook receipt (debug level only)
+    logger.debug("Webhook received")
+    
+    # Require a declared body size before reading anything
+    # GitHub always sends Content-Length; with it, Flask rejects bodies over
+    # MAX_CONTENT_LENGTH with a 413 before we buffer or hash a single byte.
+    # Chunked bodies are refused too: without a length, an oversized body
+    # is silently truncated at the limit instead of rejected.
+    if request.content_length is None:
+        logger.warning("Webhook rejected: no Content-Length")
+        return jsonify({'error': 'Length required'}), 411
     
     # Extract important headers
     # X-GitHub-Event tells us what type of event this is
@@ -118,135 +308,70 @@ def receiver():
     signature = request.headers.get('X-Hub-Signature-256')
     
     # Log event details for debugging
-    print(f"Event Type: {event_type}")
-    print(f"Content-Type: {request.headers.get('Content-Type')}")
+    logger.debug("Event Type: %s", event_type)
+    logger.debug("Content-Type: %s", request.headers.get('Content-Type'))
     
     # Get webhook secret from app configuration
     # current_app is a proxy to the active Flask application
     from flask import current_app
     webhook_secret = current_app.config.get('WEBHOOK_SECRET')
-
+    
+    # Read the raw body once - these exact bytes are what the HMAC signature
+    # covers, so the same buffer is verified below and then parsed by orjson
+    # (request.json would keep a second, decoded copy)
+    # Raises a 413 if the body is larger than MAX_CONTENT_LENGTH
+    raw_body = request.get_data(cache=True)
+    
+    # Verify the HMAC signature before doing anything with the payload
+    # Malformed headers are rejected before any hashing takes place
+    if not verify_webhook_signature(raw_body, signature, webhook_secret):
+        logger.warning("Webhook rejected: invalid signature for %s event", event_type)
+        return jsonify({'error': 'Invalid signature'}), 401
     
     # Parse JSON payload with error handling
+    # orjson parses large GitHub payloads (100 KB+ for pull requests)
+    # several times faster than the stdlib json behind request.json
     try:
-        payload = request.json
+        if not raw_body:
+            logger.warning("No JSON payload received")
+            return jsonify({'error': 'No payload'}), 400
+        payload = orjson.loads(raw_body)
         if not payload:
-            print("❌ No JSON payload received")
+            logger.warning("No JSON payload received")
             return jsonify({'error': 'No payload'}), 400
+        # Webhook payloads are always JSON objects; anything else (e.g. a
+        # list) can't be dispatched below
+        if not isinstance(payload, dict):
+            logger.warning("JSON payload is not an object: %s", type(payload).__name__)
+            return jsonify({'error': 'Invalid JSON'}), 400
     except Exception as e:
-        print(f"❌ Error parsing JSON: {e}")
+        logger.warning("Error parsing JSON: %s", e)
         return jsonify({'error': 'Invalid JSON'}), 400
     
-    print(f"Payload received: {event_type}")
-    
-    # Initialize variable to hold extracted event data
-    event_data = None
+    logger.debug("Payload received: %s", event_type)
     
-    # Process different event types
-    # Each event type has different payload structure
-    
-    if event_type == 'push':
-        """
-        Push Event Processing
-        
-        Triggered when commits are pushed to the repository.
-        
-        Payload Structure:
-            {
-                "ref": "refs/heads/main",        # Branch reference
-                "after": "abc123...",            # Commit SHA after push
-                "pusher": {
-                    "name": "username",          # GitHub username
-                    "email": "user@example.com"
-                },
-                ...
-            }
-        """
-        event_data = {
-            'request_id': payload.get('after', 'unknown'),  # Commit SHA
-            'author': payload.get('pusher', {}).get('name', 'Unknown'),
-            'action': 'PUSH',
-            'from_branch': None,  # Push events don't have a source branch
-            'to_branch': payload.get('ref', '').replace('refs/heads/', ''),  # Extract branch name
-            'timestamp': datetime.utcnow().isoformat()  # Current UTC time
-        }
-        print(f"✅ Push event: {event_data['author']} pushed to {event_data['to_branch']}")
+    # Look up the handler for this event type and action
+    # Each event type has a different payload structure, so each handler
+    # knows how to extract our event fields from its own payload
+    handler = _HANDLERS.get((event_type, payload.get('action')))
+    event_data = handler(payload) if handler else None
     
-    elif event_type == 'pull_request':
-        """
-        Pull Request Event Processing
-        
-        Triggered for PR actions: opened, closed, reopened, etc.
-        We handle 'opened', 'reopened' as PULL_REQUEST events
-        and 'closed' with merged=true as MERGE events.
-        
-        Payload Structure:
-            {
-                "action": "opened|closed|reopened|...",
-                "pull_request": {
-                    "id": 123,
-                    "user": {"login": "username"},
-                    "head": {"ref": "feature-branch"},
-                    "base": {"ref": "main"},
-                    "merged": true|false,
-                    "merged_by": {"login": "username"},
-                    "merge_commit_sha": "abc123..."
-                }
-            }
-        """
-        # Get the specific PR action
-        action = payload.get('action')
-        # Extract PR details
-        pr = payload.get('pull_request', {})
-        
-        if action == 'opened' or action == 'reopened':
-            # Handle PR creation/reopening
-            event_data = {
-                'request_id': str(pr.get('id', 'unknown')),  # PR ID as string
-                'author': pr.get('user', {}).get('login', 'Unknown'),  # PR creator
-                'action': 'PULL_REQUEST',
-                'from_branch': pr.get('head', {}).get('ref', 'unknown'),  # Source branch
-                'to_branch': pr.get('base', {}).get('ref', 'unknown'),    # Target branch
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            print(f"✅ PR event: {event_data['author']} created PR from {event_data['from_branch']} to {event_data['to_branch']}")
-        
-        elif action == 'closed' and pr.get('merged'):
-            # Handle PR merge (special case of closed PR where merged=true)
-            event_data = {
-                'request_id': pr.get('merge_commit_sha', 'unknown'),  # Merge commit SHA
-                'author': pr.get('merged_by', {}).get('login', 'Unknown'),  # Who merged
-                'action': 'MERGE',
-                'from_branch': pr.get('head', {}).get('ref', 'unknown'),  # Source branch
-                'to_branch': pr.get('base', {}).get('ref', 'unknown'),    # Target branch
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            print(f"✅ Merge event: {event_data['author']} merged {event_data['from_branch']} to {event_data['to_branch']}")
-    
-    # If we extracted event data, save it to MongoDB
+    # If we extracted event data, queue it for MongoDB
     if event_data:
-        try:
-            # Insert the event document into MongoDB
-            # mongo.db.events accesses the 'events' collection
-            result = mongo.db.events.insert_one(event_data)
-            print(f"✅ Event saved to MongoDB with ID: {result.inserted_id}")
-            
-            # Return success response with the created document ID
-            return jsonify({
-                'status': 'success',
-                'id': str(result.inserted_id)  # Convert ObjectId to string
-            }), 200
-            
-        except Exception as e:
-            # Log and return database errors
-            print(f"❌ Error saving to MongoDB: {e}")
-            return jsonify({
-                'error': 'Database error',
-                'message': str(e)
-            }), 500
+        # Assign the document ID here so we can return it right away
+        # The background flusher writes the event with insert_many
+        event_data['_id'] = ObjectId()
+        event_queue.put(event_data)
+        logger.debug("Event queued for MongoDB with ID: %s", event_data['_id'])
+        
+        # Return success response with the queued document ID
+        return jsonify({
+            'status': 'success',
+            'id': str(event_data['_id'])  # Convert ObjectId to string
+        }), 200
     
     # If event_data is None, this event type is not handled
-    print(f"⚠️ Event ignored: {event_type} - {payload.get('action', 'no action')}")
+    logger.debug("Event ignored: %s - %s", event_type, payload.get('action', 'no action'))
     return jsonify({
         'status': 'ignored',
         'reason': 'Event type not handled'
@@ -270,11 +395,11 @@ def test():
         {
             "status": "ok",
             "message": "Webhook endpoint is working",
-            "timestamp": "2024-01-01T12:00:00.000000"
+            "timestamp": "2024-01-01T12:00:00.000000+00:00"
         }
     """
     return jsonify({
         'status': 'ok',
         'message': 'Webhook endpoint is working',
-        'timestamp': datetime.utcnow().isoformat()  # Current UTC timestamp
+        'timestamp': datetime.now(_UTC).isoformat()  # Current UTC timestamp
     })
@@ -16,6 +16,7 @@ Environment Variables Expected:
     SECRET_KEY: Flask secret key for session encryption
     MONGO_URI: MongoDB connection string with credentials
     WEBHOOK_SECRET: GitHub webhook verification secret
+    LOG_LEVEL: Application log level (optional, defaults to WARNING)
 """
 
 import os
@@ -69,4 +70,25 @@ class Config:
     
     WEBHOOK_SECRET = os.environ.get('WEBHOOK_SECRET')
     
+    # Request Size Limit
+    # ==================
+    # Flask rejects request bodies larger than this with 413 Payload Too
+    # Large before the view runs, so oversized payloads are never buffered
+    # or hashed. GitHub webhook payloads rarely exceed 500 KB.
+    MAX_CONTENT_LENGTH = 1 * 1024 * 1024  # 1 MB
     
+    # Response Compression Configuration
+    # ==================================
+    # Used by Flask-Compress. Only JSON responses (i.e. /api/events) are
+    # compressed; level 4 gives most of the size reduction for little CPU
+    COMPRESS_MIMETYPES = ['application/json']
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_LEVEL = 4
+    COMPRESS_BR_LEVEL = 4
+    
+    # Logging Configuration
+    # =====================
+    # Log level for the application's loggers (DEBUG, INFO, WARNING, ...)
+    # Defaults to WARNING so per-webhook debug messages cost nothing in
+    # production; set LOG_LEVEL=DEBUG locally to see every event
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'WARNING').upper()
@@ -0,0 +1,61 @@
+"""
+Gunicorn Configuration
+======================
+Gunicorn loads this file automatically when started from the project root.
+
+MongoClient and background threads are not fork-safe. Without --preload each
+worker imports and creates the app after forking, so nothing needs to be done.
+With --preload the app is created once in the master process, which connects
+to MongoDB (to create the events collection and index) and starts the event
+queue thread there. The master never serves requests, so its client is closed
+and its flusher thread is stopped once the app is loaded - before any worker
+is forked - and each worker builds its own client and flusher after the fork.
+"""
+
+
+def when_ready(server):
+    """
+    Release the master's MongoDB client and flusher thread once a preloaded
+    app is ready.
+    
+    This runs before the first worker is forked, so no worker inherits a
+    running flusher (or a lock it happened to hold at fork time).
+    
+    Args:
+        server (Arbiter): The gunicorn master process
+    """
+    from app.extensions import mongo
+    from app.webhook.queue import event_queue
+    
+    if mongo.client is not None:
+        mongo.client.close()
+        event_queue.shutdown()
+
+
+def post_fork(server, worker):
+    """
+    Give a freshly forked worker its own MongoDB client and event queue.
+    
+    Only the client is rebuilt; the collection and index were already set
+    up when the master created the app.
+    
+    Args:
+        server (Arbiter): The gunicorn master process
+        worker (Worker): The newly forked worker
+    """
+    from app.extensions import mongo
+    from app.webhook.queue import event_queue
+    
+    # No client yet means the app wasn't preloaded in the master;
+    # the worker will create it (and connect) on its own
+    if mongo.client is None:
+        return
+    
+    # server.app.wsgi() returns the app already loaded in the master
+    flask_app = server.app.wsgi()
+    mongo.connect(flask_app)
+    
+    # The master's queue was shut down in when_ready, so start from fresh
+    # state; otherwise the new flusher would see _stopping set and exit
+    event_queue.reset()
+    event_queue.init_app(flask_app)
@@ -0,0 +1,43 @@
+"""
+Shared pytest fixtures.
+
+MongoDB is replaced with mongomock so the app can be created and exercised
+without a running database.
+"""
+
+import mongomock
+import pytest
+
+import config
+import app.extensions as extensions
+from app import create_app
+
+WEBHOOK_SECRET = 'test-secret'
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """Create an app backed by an in-memory MongoDB."""
+    monkeypatch.setattr(extensions, 'MongoClient', mongomock.MongoClient)
+    # mongomock can't create capped collections, so create a plain one
+    # instead; the rest of the collection setup (the index) still runs
+    create_collection = mongomock.database.Database.create_collection
+    monkeypatch.setattr(
+        mongomock.database.Database, 'create_collection',
+        lambda self, name, **kwargs: create_collection(self, name)
+    )
+    monkeypatch.setattr(config.Config, 'MONGO_URI', 'mongodb://localhost')
+    monkeypatch.setattr(config.Config, 'WEBHOOK_SECRET', WEBHOOK_SECRET)
+
+    with extensions.events_cache_lock:
+        extensions.events_cache.clear()
+
+    flask_app = create_app()
+    flask_app.config['TESTING'] = True
+    yield flask_app
+
+
+@pytest.fixture
+def client(app):
+    """Test client for the app."""
+    return app.test_client()
@@ -0,0 +1,70 @@
+"""
+Tests for the /api/events endpoint.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.extensions import mongo
+
+
+@pytest.fixture
+def events(app):
+    """Store enough events that the response is large enough to compress."""
+    mongo.db.events.insert_many([
+        {
+            'request_id': 'sha-%d' % i,
+            'author': 'testuser',
+            'action': 'PUSH',
+            'from_branch': None,
+            'to_branch': 'feature/branch-%d' % i,
+            'timestamp': datetime(2024, 1, 1, 12, i, tzinfo=timezone.utc),
+        }
+        for i in range(10)
+    ])
+
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip', 'identity'])
+def test_unchanged_events_return_304(client, events, encoding):
+    first = client.get('/api/events', headers={'Accept-Encoding': encoding})
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    if encoding != 'identity':
+        # Flask-Compress appends the algorithm to the ETag
+        assert first.headers['Content-Encoding'] == encoding
+        assert etag.endswith(':%s"' % encoding)
+
+    second = client.get('/api/events', headers={
+        'Accept-Encoding': encoding,
+        'If-None-Match': etag,
+    })
+
+    assert second.status_code == 304
+    assert second.data == b''
+
+
+def test_stale_etag_returns_events(client, events):
+    response = client.get('/api/events', headers={
+        'Accept-Encoding': 'br',
+        'If-None-Match': '"stale:br"',
+    })
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'br'
+
+
+def test_events_are_serialized_newest_first(client, events):
+    response = client.get('/api/events')
+
+    body = response.get_json()
+    assert len(body) == 10
+    assert body[0]['request_id'] == 'sha-9'
+    assert body[0]['timestamp'] == '2024-01-01T12:09:00+00:00'
+    assert '_id' not in body[0]
+
+
+def test_events_are_indexed_by_timestamp(app):
+    indexes = mongo.db.events.index_information()
+
+    assert indexes['ts_desc']['key'] == [('timestamp', -1)]
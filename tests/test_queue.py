@@ -0,0 +1,91 @@
+"""
+Tests for the background event write queue.
+"""
+
+from types import SimpleNamespace
+
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from app.webhook import queue as queue_module
+from app.webhook.queue import EventQueue
+
+
+class FlakyCollection:
+    """Fake events collection whose first `failures` writes raise."""
+
+    def __init__(self, failures, error=None):
+        self.failures = failures
+        self.error = error or AutoReconnect('connection refused')
+        self.saved = []
+
+    def insert_many(self, documents, ordered=True):
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.saved.extend(documents)
+
+
+def use_collection(monkeypatch, collection):
+    fake_mongo = SimpleNamespace(db=SimpleNamespace(events=collection))
+    monkeypatch.setattr(queue_module, 'mongo', fake_mongo)
+
+
+def test_failed_batch_is_requeued_in_order(monkeypatch):
+    collection = FlakyCollection(failures=1)
+    use_collection(monkeypatch, collection)
+    event_queue = EventQueue()
+    events = [{'_id': i, 'request_id': str(i)} for i in range(3)]
+    for event in events:
+        event_queue.put(event)
+
+    assert event_queue._flush() is False
+    assert list(event_queue._events) == events
+
+    assert event_queue._flush() is True
+    assert collection.saved == events
+    assert not event_queue._events
+
+
+def test_batch_is_dropped_after_max_retries(monkeypatch):
+    collection = FlakyCollection(failures=EventQueue.MAX_RETRIES + 1)
+    use_collection(monkeypatch, collection)
+    event_queue = EventQueue()
+    event_queue.put({'_id': 1, 'request_id': 'abc'})
+
+    for _ in range(EventQueue.MAX_RETRIES):
+        assert event_queue._flush() is False
+
+    assert event_queue._flush() is True
+    assert not event_queue._events
+    assert collection.saved == []
+
+
+def test_duplicate_ids_from_partial_write_are_not_retried(monkeypatch):
+    error = BulkWriteError({'writeErrors': [
+        {'index': 0, 'code': queue_module.DUPLICATE_KEY_ERROR},
+        {'index': 1, 'code': 91},
+    ]})
+    collection = FlakyCollection(failures=1, error=error)
+    use_collection(monkeypatch, collection)
+    event_queue = EventQueue()
+    events = [{'_id': 1}, {'_id': 2}]
+    for event in events:
+        event_queue.put(event)
+
+    assert event_queue._flush() is False
+    assert list(event_queue._events) == [events[1]]
+
+
+def test_reset_after_shutdown_starts_a_working_flusher(monkeypatch):
+    collection = FlakyCollection(failures=0)
+    use_collection(monkeypatch, collection)
+    event_queue = EventQueue()
+    event_queue.init_app(None)
+    event_queue.shutdown()
+
+    event_queue.reset()
+    event_queue.init_app(None)
+    event_queue.put({'_id': 1, 'request_id': 'abc'})
+    event_queue.shutdown()
+
+    assert collection.saved == [{'_id': 1, 'request_id': 'abc'}]
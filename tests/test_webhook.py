@@ -0,0 +1,95 @@
+"""
+Tests for the GitHub webhook receiver.
+"""
+
+import hashlib
+import hmac
+import io
+import json
+
+from tests.conftest import WEBHOOK_SECRET
+
+PUSH_PAYLOAD = json.dumps({
+    'ref': 'refs/heads/main',
+    'after': 'abc123',
+    'pusher': {'name': 'testuser'},
+}).encode('utf-8')
+
+
+def sign(body, secret=WEBHOOK_SECRET):
+    """Build an X-Hub-Signature-256 header value the way GitHub does."""
+    return 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+
+def post_push(client, signature):
+    headers = {
+        'X-GitHub-Event': 'push',
+        'Content-Type': 'application/json',
+    }
+    if signature is not None:
+        headers['X-Hub-Signature-256'] = signature
+    return client.post('/webhook/receiver', data=PUSH_PAYLOAD, headers=headers)
+
+
+def test_valid_signature_is_accepted(client):
+    response = post_push(client, sign(PUSH_PAYLOAD))
+
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'success'
+
+
+def test_missing_signature_is_rejected(client):
+    response = post_push(client, None)
+
+    assert response.status_code == 401
+
+
+def test_malformed_signature_is_rejected(client):
+    for signature in ['sha1=' + 'a' * 40,
+                      'sha256=' + 'A' * 64,
+                      'sha256=' + 'z' * 64,
+                      'sha256=' + 'a' * 63,
+                      sign(PUSH_PAYLOAD)[7:]]:
+        response = post_push(client, signature)
+
+        assert response.status_code == 401, signature
+
+
+def test_wrong_digest_is_rejected(client):
+    response = post_push(client, sign(PUSH_PAYLOAD, secret='wrong-secret'))
+
+    assert response.status_code == 401
+    assert response.get_json() == {'error': 'Invalid signature'}
+
+
+def test_oversized_body_is_rejected_before_verification(client, app):
+    body = b'x' * (app.config['MAX_CONTENT_LENGTH'] + 1)
+
+    response = client.post('/webhook/receiver', data=body, headers={
+        'X-GitHub-Event': 'push',
+        'X-Hub-Signature-256': sign(body),
+    })
+
+    assert response.status_code == 413
+
+
+def test_chunked_body_without_length_is_rejected(client):
+    response = client.post('/webhook/receiver', input_stream=io.BytesIO(PUSH_PAYLOAD), headers={
+        'X-GitHub-Event': 'push',
+        'X-Hub-Signature-256': sign(PUSH_PAYLOAD),
+        'Transfer-Encoding': 'chunked',
+    })
+
+    assert response.status_code == 411
+
+
+def test_non_object_payload_is_rejected(client):
+    body = b'[1]'
+
+    response = client.post('/webhook/receiver', data=body, headers={
+        'X-GitHub-Event': 'push',
+        'X-Hub-Signature-256': sign(body),
+    })
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid JSON'}